@@ -0,0 +1,49 @@
+"""
+Compares MSWordWriter (python-docx) with StreamingWordWriter on large exports.
+
+Each writer runs in a fresh process so peak memory is measured independently.
+Run from the project root:
+    python -m benchmarks.bench_docx_writers
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+from src.services.doc_writers import MSWordWriter, StreamingWordWriter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+WRITERS = {'python-docx': MSWordWriter, 'streaming': StreamingWordWriter}
+TRANSCRIPT = ("So today we are going to talk about how this works and why it matters for everyone. " * 12 + "\n") * 50
+
+
+def run_writer(name, video_count, results):
+    with tempfile.TemporaryDirectory() as storage_path:
+        start = time.perf_counter()
+        writer = WRITERS[name](storage_path)
+        for i in range(video_count):
+            writer.write_video(f"Video {i}: a fairly typical YouTube title", TRANSCRIPT)
+        writer.save()
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(storage_path, f)) for f in os.listdir(storage_path))
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    if peak and os.uname().sysname == 'Darwin':
+        peak //= 1024
+    results.put((elapsed, peak / 1024, size / 1e6))
+
+
+if __name__ == "__main__":
+    print(f"Transcript size per video: {len(TRANSCRIPT) / 1e3:.0f} KB")
+    for video_count in (100, 1000, 3000):
+        print(f"\n{video_count} videos")
+        for name in WRITERS:
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_writer, args=(name, video_count, results))
+            process.start()
+            elapsed, peak_mb, size_mb = results.get()
+            process.join()
+            print(f"  {name:<12} {elapsed:8.2f} s   peak RSS {peak_mb:8.0f} MB   output {size_mb:6.1f} MB")
@@ -0,0 +1,68 @@
+"""
+Benchmarks transcript normalization on large synthetic auto-caption transcripts.
+
+Run from the project root:
+    python -m benchmarks.bench_transcript_normalizer
+"""
+import random
+import time
+from src.services.transcript_normalizer import normalize_transcript, merge_caption_snippets, strip_xml_invalid
+
+# A vocabulary with a Zipf-like spread, so common words recur about as often as in real speech.
+WORDS = ("the the the a a and and to to of of I I you you it it is that that we so this in "
+         "going talk about new video how works for everyone who watches channel thank being here "
+         "today really think know people time right kind actually want make little bit look "
+         "first thing because just like would could should little different").split()
+TAGS = ["[Music]", "[Applause]", "[Laughter]", "[ __ ]", ">>", "♪"]
+
+
+def make_snippets(target_bytes, seed=0):
+    """Builds caption snippets that look like rolling auto-captions, each on screen into the next."""
+    rng = random.Random(seed)
+    segments = []
+    size = 0
+    start = 0.0
+    previous = []
+    while size < target_bytes:
+        repeated = rng.randint(0, 5)
+        words = previous[len(previous) - repeated:] if repeated else []  # rolling repeat of the last line
+        words += [rng.choice(WORDS) for _ in range(rng.randint(4, 10))]
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words)), rng.choice(TAGS))
+        if rng.random() < 0.01:
+            words.append("\x0b")
+        segment = ' '.join(words) + '\n'
+        segments.append({'text': segment, 'start': start, 'duration': 4.0})
+        size += len(segment)
+        start += 2.5
+        previous = words
+    return segments
+
+
+def legacy_sanitize(content):
+    # The per-character filter MSWordWriter used before the normalization stage.
+    return "".join(c for c in content if c.isprintable() or c in ('\n', '\t', '\r'))
+
+
+def bench(label, func, data, size, repeat=3):
+    best = min(_timed(func, data) for _ in range(repeat))
+    print(f"  {label:<28} {best * 1000:9.1f} ms  ({size / best / 1e6:6.1f} MB/s)")
+
+
+def _timed(func, data):
+    start = time.perf_counter()
+    func(data)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for megabytes in (1, 4, 16):
+        snippets = make_snippets(megabytes * 1_000_000)
+        text = ' '.join(snippet['text'] for snippet in snippets)
+        normalized = normalize_transcript(merge_caption_snippets(snippets))
+        print(f"{megabytes} MB transcript -> {len(normalized) / 1e6:.2f} MB after merging and normalization "
+              f"({100 - len(normalized) / len(text) * 100:.0f}% smaller)")
+        bench("legacy per-char sanitize", legacy_sanitize, text, len(text))
+        bench("strip_xml_invalid", strip_xml_invalid, text, len(text))
+        bench("merge_caption_snippets", merge_caption_snippets, snippets, len(text))
+        bench("normalize_transcript", normalize_transcript, text, len(text))
@@ -1,10 +1,16 @@
 import os
+import sys
+import time
+from src.config import WORD_DOCX_ENGINE
 from src.services.youtube_service import YouTubeService
 from src.services.ai_services import AIService
-from src.services.doc_writers import GoogleDocsWriter, MSWordWriter
+from src.services.doc_writers import GoogleDocsWriter, MSWordWriter, StreamingWordWriter
+from src.services.request_executor import ServiceError, CircuitOpenError
+from src.services.transcript_normalizer import normalize_transcript
 from src.extractors.video_extractor import VideoExtractor
 from src.extractors.channel_extractor import ChannelExtractor
 from src.extractors.playlist_extractor import PlaylistExtractor
+from src.extractors.job_planner import JobPlanner
 
 
 class Application:
@@ -74,6 +80,8 @@ class Application:
 
         elif doc_type == '2':  # MS Word
             storage_path = self._get_storage_path()
+            if WORD_DOCX_ENGINE == 'streaming':
+                return StreamingWordWriter(storage_path)
             return MSWordWriter(storage_path)
         return None
 
@@ -88,7 +96,7 @@ class Application:
                 print("Error: Invalid YouTube channel ID\n")
             period = self.youtube_service.get_survey_period()
             include_shorts = self._get_yes_no_response("\nWould you like to capture YouTube shorts? [y/n]\n")
-            return ChannelExtractor(self.youtube_service, channel_id, period, include_shorts)
+            return self._plan_if_requested(ChannelExtractor(self.youtube_service, channel_id, period, include_shorts))
 
         if task == '3':  # Playlist
             while True:
@@ -100,7 +108,24 @@ class Application:
                 print("Error: Invalid YouTube playlist URL or ID not found.\n")
             period = self.youtube_service.get_survey_period()
             include_shorts = self._get_yes_no_response("\nWould you like to capture YouTube shorts? [y/n]\n")
-            return PlaylistExtractor(self.youtube_service, playlist_id, period, include_shorts)
+            return self._plan_if_requested(PlaylistExtractor(self.youtube_service, playlist_id, period, include_shorts))
+        return None
+
+    def _plan_if_requested(self, extractor):
+        """Optionally estimates the cost of the run. Returns the extractor, or None if the user backs out."""
+        if not self._get_yes_no_response("\nWould you like a cost and duration estimate before we start? [y/n]\n"):
+            return extractor
+
+        print("\n🧮 Counting the treasure before we dig... this only uses a few quota units.")
+        try:
+            plan = JobPlanner(extractor).plan()
+        except ServiceError as e:
+            print(f"Error: Could not plan this run: {e}")
+        else:
+            print(f"\n{plan.report()}")
+
+        if self._get_yes_no_response("\nShall we start the extraction? [y/n]\n"):
+            return extractor
         return None
 
     def _process_videos_from_extractor(self, extractor, writer):
@@ -116,13 +141,21 @@ class Application:
               "👀 Behold our conquered treasures below!\n")
 
         video_count = 0
+        skipped_videos = []
 
-
-        for video_data in extractor.video_generator():
-            self._process_single_video(video_data, writer, use_ai_format)
-            video_count += 1
+        try:
+            for video_data in extractor.video_generator():
+                if self._process_single_video(video_data, writer, use_ai_format):
+                    video_count += 1
+                else:
+                    skipped_videos.append(video_data)
+        except ServiceError as e:
+            # Retries are exhausted or the backend is down; keep what we have instead of losing the run.
+            print(f"\n❌ Could not fetch more videos: {e}\nSaving the videos processed so far.")
 
         print(f"\n✅ Processed a total of {video_count} videos.")
+        self._report_skipped_videos(skipped_videos)
+        print(f"📦 {self.youtube_service.metadata_cache.summary()}")
         writer.save()
         print(f"🎉 {extractor.SUCCESS_MESSAGE}")
         print(f"🟢 Note: {extractor.SORTING_ORDER_NOTE}\n")
@@ -132,23 +165,26 @@ class Application:
         videos_to_process = []
         extractor = VideoExtractor(self.youtube_service)
 
-        while True:
-            video_url = input("\nEnter a YouTube video URL (or 'done' to finish): ")
-            if video_url.lower() == 'done':
-                break
+        if self._get_yes_no_response("\nDo you have a list of video URLs in a file (or to paste)? [y/n]\n"):
+            videos_to_process = self._get_videos_in_bulk(extractor)
+        else:
+            while True:
+                video_url = input("\nEnter a YouTube video URL (or 'done' to finish): ")
+                if video_url.lower() == 'done':
+                    break
 
-            try:
-                video_data = extractor.get_video(video_url)
-                if video_data:
-                    videos_to_process.append(video_data)
-                else:
-                    print("Could not retrieve video details. It might be private or invalid.")
+                try:
+                    video_data = extractor.get_video(video_url)
+                    if video_data:
+                        videos_to_process.append(video_data)
+                    else:
+                        print("Could not retrieve video details. It might be private or invalid.")
+                        if not self._get_yes_no_response("\nWould you like to skip this video and try another? [y/n]\n"):
+                            return
+                except Exception as e:
+                    print(f"An error occurred: {e}")
                     if not self._get_yes_no_response("\nWould you like to skip this video and try another? [y/n]\n"):
                         return
-            except Exception as e:
-                print(f"An error occurred: {e}")
-                if not self._get_yes_no_response("\nWould you like to skip this video and try another? [y/n]\n"):
-                    return
 
         if not videos_to_process:
             print("No videos were added to process.")
@@ -162,21 +198,61 @@ class Application:
         print("\n🛳️ Our vessel is blasting through this YouTube galaxy, capturing every video whisper in its path.\n"
               "👀 Behold our conquered treasures below!\n")
 
-        for video_data in videos_to_process:
-            self._process_single_video(video_data, writer, use_ai_format)
+        skipped_videos = [video_data for video_data in videos_to_process
+                          if not self._process_single_video(video_data, writer, use_ai_format)]
+        self._report_skipped_videos(skipped_videos)
 
         writer.save()
         print("🎉 Transcripts kidnapped successfully!!")
         print(
             "🟢 Note: The videos in the doc are sorted from the first video you entered to the last video you entered.\n")
 
+    def _get_videos_in_bulk(self, extractor):
+        """Reads video URLs from a file or stdin and resolves them in batches."""
+        while True:
+            source = input("\nEnter the path to a text/CSV file with one URL per line,\n"
+                           "or '-' to paste the URLs here and finish with Ctrl-D (Ctrl-Z then Enter on Windows): ")
+            if source == '-':
+                lines = sys.stdin.readlines()
+                break
+            try:
+                with open(source, 'r', encoding='utf-8-sig') as f:
+                    lines = f.readlines()
+                break
+            except OSError as e:
+                print(f"Uh-oh! Could not read that file: {e}\n")
+
+        try:
+            videos, invalid_entries, unavailable_ids = extractor.get_videos(lines)
+        except ServiceError as e:
+            print(f"Error: Could not retrieve video details: {e}")
+            return []
+
+        print(f"\n🔎 Found {len(videos)} videos.")
+        if invalid_entries:
+            print(f"⚠️ {len(invalid_entries)} entries did not contain a video URL or ID:")
+            for entry in invalid_entries:
+                print(f"   - {entry}")
+        if unavailable_ids:
+            print(f"⚠️ {len(unavailable_ids)} videos are private, deleted or invalid:")
+            for video_id in unavailable_ids:
+                print(f"   - https://www.youtube.com/watch?v={video_id}")
+        return videos
+
     def _process_single_video(self, video_data, writer, use_ai_format):
-        """Core logic to fetch transcript, format, and write a single video."""
+        """
+        Core logic to fetch transcript, format, and write a single video.
+        Returns False if the video was skipped because its transcript could not be fetched.
+        """
         video_title = video_data.get('title', 'Untitled Video')
         video_id = video_data['id']
         print(f"{video_title}\n")
 
-        captions = self.youtube_service.get_transcript(video_id)
+        try:
+            captions = self._call_waiting_for_breaker(self.youtube_service.get_transcript, video_id)
+        except ServiceError as e:
+            print(f"Error retrieving transcript: {e}. Skipping this video.\n")
+            return False
 
         if captions is None:
             print("😯 Bummer! This video doesn't have a built-in transcript.")
@@ -184,14 +260,25 @@ class Application:
                     "Would you like our AI buddy to transcribe it for you? This can take a while. [y/n] "):
                 video_url = f"https://www.youtube.com/watch?v={video_id}"
                 print("🔊 Transcribing audio... please be patient.")
-                captions = self.ai_service.transcribe_audio_hf(video_url)
+                try:
+                    captions = self._call_waiting_for_breaker(self.ai_service.transcribe_audio_hf, video_url)
+                except ServiceError as e:
+                    print(f"Error during AI transcription: {e}. Skipping this video.\n")
+                    return False
+
+        if captions:
+            captions = normalize_transcript(captions)
 
         if not captions:
             captions = "No transcript available for this video."
 
         if use_ai_format and captions != "No transcript available for this video.":
             print("🤖 AI is polishing the text...")
-            formatted_captions = self.ai_service.format_text_gemini(captions)
+            try:
+                formatted_captions = self.ai_service.format_text_gemini(captions)
+            except ServiceError as e:
+                print(f"Error with AI formatting: {e}")
+                formatted_captions = None
             if formatted_captions:
                 captions = formatted_captions
             else:
@@ -201,6 +288,27 @@ class Application:
             writer.write_video(video_title, captions)
         except Exception as e:
             print(f"Error: Failed to write text for video: {video_title}. Reason: {e}")
+        return True
+
+    def _call_waiting_for_breaker(self, func, *args):
+        """
+        Calls func(*args). If its backend's circuit breaker is open, waits until a trial call is allowed
+        and tries once more, so a run pauses through an outage instead of skipping every video in it.
+        """
+        try:
+            return func(*args)
+        except CircuitOpenError as e:
+            print(f"⏸️ {e} Pausing until then...")
+            time.sleep(e.retry_after)
+            return func(*args)
+
+    def _report_skipped_videos(self, skipped_videos):
+        """Lists the videos left out of the document because their transcript could not be fetched."""
+        if not skipped_videos:
+            return
+        print(f"⚠️ {len(skipped_videos)} videos were skipped because their transcript could not be fetched:")
+        for video_data in skipped_videos:
+            print(f"   - {video_data.get('title', 'Untitled Video')}: https://www.youtube.com/watch?v={video_data['id']}")
 
     def _get_storage_path(self):
         """Gets a valid directory path from the user for saving files."""
@@ -25,4 +25,45 @@ HF_ASR_MODEL = "openai/whisper-large-v3"
 GEMINI_MODEL_NAME = "gemini-1.5-flash"
 
 # --- Constants ---
-MAX_SHORT_DURATION_SECONDS = 60
\ No newline at end of file
+MAX_SHORT_DURATION_SECONDS = 60
+
+# --- Request Execution ---
+# Applied to every external call (YouTube, Google Docs, Gemini, Hugging Face).
+REQUEST_TIMEOUT_SECONDS = 60
+AI_REQUEST_TIMEOUT_SECONDS = 600  # ASR on long audio and formatting of long transcripts are slow
+REQUEST_MAX_RETRIES = 4
+REQUEST_BACKOFF_BASE_SECONDS = 1
+REQUEST_BACKOFF_MAX_SECONDS = 32
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failed calls (after their retries) before a backend is considered down
+CIRCUIT_RESET_SECONDS = 60
+
+# --- Pagination ---
+# Number of list pages fetched ahead in the background while the current page is processed (0 disables).
+PAGE_PREFETCH_DEPTH = 1
+
+# --- Metadata Cache ---
+# YouTube Data API list responses are cached locally and revalidated with their ETag.
+METADATA_CACHE_PATH = os.path.join(basedir, "cache", "youtube_metadata.sqlite3")
+METADATA_CACHE_TTL_SECONDS = 60 * 60  # served without any request while younger than this
+METADATA_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60  # dropped if not revalidated for this long
+
+# --- Transcripts ---
+# Caption languages in order of preference. If none exist, a translation into the first available one is used.
+TRANSCRIPT_LANGUAGES = ['en', 'vi']
+TRANSCRIPT_LIST_CACHE_SIZE = 256  # videos whose caption track listing is kept in memory
+
+# --- Word Output ---
+# 'streaming' writes the .docx incrementally with constant memory; 'python-docx' builds it in memory.
+WORD_DOCX_ENGINE = "streaming"
+
+# --- Job Planning ---
+# Rough figures used to estimate a run before it starts. Tune them to what you observe.
+YOUTUBE_DAILY_QUOTA_UNITS = 10000  # default YouTube Data API quota per project
+PLAN_CAPTION_SAMPLE_SIZE = 100  # videos checked for captions; the rest is extrapolated (None checks all)
+PLAN_CONCURRENCY = 1  # videos processed at the same time (the CLI processes them one by one)
+SPEECH_WORDS_PER_MINUTE = 150
+TOKENS_PER_WORD = 1.35
+FORMAT_PROMPT_TOKENS = 80  # instructions sent along with each transcript
+SECONDS_PER_TRANSCRIPT_FETCH = 2
+ASR_SECONDS_PER_AUDIO_MINUTE = 6  # audio download + Whisper inference
+FORMAT_OUTPUT_TOKENS_PER_SECOND = 150
@@ -1,6 +1,7 @@
 import datetime
 from abc import ABC, abstractmethod
 from src.config import MAX_SHORT_DURATION_SECONDS
+from src.services.request_executor import ServiceError
 
 
 class Extractor(ABC):
@@ -8,6 +9,16 @@ class Extractor(ABC):
 
     SUCCESS_MESSAGE = "Processing complete!"
     SORTING_ORDER_NOTE = "Order depends on the source."
+    # The YouTubeService method video_generator() lists the source with, and the YouTube Data API
+    # quota units of one page of it.
+    LISTING_METHOD = 'fetch_playlist_videos_sequentially'
+    PAGE_QUOTA_COST = 1
+    # The most videos that listing can return (None: no limit), newest first.
+    LISTING_MAX_RESULTS = None
+    # Quota units planning_generator() spends before its first page, and whether it makes the same
+    # list requests as video_generator(), so that planning fills the metadata cache for the run.
+    PLANNING_SETUP_QUOTA_COST = 0
+    PLANNING_SHARES_RUN_LISTING = True
 
     def __init__(self, youtube_service, period='all', include_shorts=True):
         self.service = youtube_service
@@ -21,14 +32,27 @@ class Extractor(ABC):
         """
         pass
 
+    @abstractmethod
+    def planning_generator(self):
+        """
+        A generator that yields the same videos as the source listing of video_generator(), unfiltered,
+        using the cheapest API calls available. Each video's 'published_at' must be the date
+        is_within_period() sees during the run. Used to plan a run before starting it.
+        """
+        pass
+
     def _is_video_valid(self, video_data):
         # 1. Check period
-        if not self._is_within_period(video_data):
+        if not self.is_within_period(video_data):
             return False
 
         # 2. Check shorts
         if not self.include_shorts:
-            details = self.service.get_video_details(video_data['id'])
+            try:
+                details = self.service.get_video_details(video_data['id'])
+            except ServiceError as e:
+                print(f"Warning: Could not get details for video '{video_data.get('title', 'N/A')}': {e}. Skipping.")
+                return False
             if not details:
                 print(f"Warning: Could not get details for video '{video_data.get('title', 'N/A')}'. Skipping.")
                 return False
@@ -41,7 +65,7 @@ class Extractor(ABC):
 
         return True
 
-    def _is_within_period(self, video_data):
+    def is_within_period(self, video_data):
         """Filters a single video based on its publication date and the period."""
         if self.period == 'all':
             return True
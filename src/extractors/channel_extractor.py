@@ -6,6 +6,11 @@ class ChannelExtractor(Extractor):
 
     SUCCESS_MESSAGE = "Woohoo! We've gone full ninja on this channel - every transcript is now our prisoner!"
     SORTING_ORDER_NOTE = "The videos in the doc are sorted from newest to oldest publication date."
+    LISTING_METHOD = 'fetch_channel_videos_sequentially'
+    PAGE_QUOTA_COST = 100  # search.list
+    LISTING_MAX_RESULTS = 500  # search.list stops after about 500 results per query
+    PLANNING_SETUP_QUOTA_COST = 1  # channels.list lookup of the uploads playlist
+    PLANNING_SHARES_RUN_LISTING = False
 
     def __init__(self, youtube_service, channel_id, period, include_shorts):
         super().__init__(youtube_service, period, include_shorts)
@@ -15,4 +20,13 @@ class ChannelExtractor(Extractor):
         """Yields valid videos from the channel sequentially."""
         for video_data in self.service.fetch_channel_videos_sequentially(self.channel_id):
             if self._is_video_valid(video_data):
-                yield video_data
\ No newline at end of file
+                yield video_data
+
+    def planning_generator(self):
+        """
+        Yields the channel's uploads from its uploads playlist, which costs 1 quota unit per page instead of 100.
+        Dated by video publication, like search.list, rather than by when they were added to the playlist.
+        """
+        uploads_playlist_id = self.service.get_uploads_playlist_id(self.channel_id)
+        if uploads_playlist_id:
+            yield from self.service.fetch_playlist_videos_sequentially(uploads_playlist_id, video_dates=True)
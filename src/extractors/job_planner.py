@@ -0,0 +1,170 @@
+import math
+import random
+from src.config import (MAX_SHORT_DURATION_SECONDS, METADATA_CACHE_TTL_SECONDS, YOUTUBE_DAILY_QUOTA_UNITS, PLAN_CAPTION_SAMPLE_SIZE,
+                        PLAN_CONCURRENCY, SPEECH_WORDS_PER_MINUTE, TOKENS_PER_WORD, FORMAT_PROMPT_TOKENS,
+                        SECONDS_PER_TRANSCRIPT_FETCH, ASR_SECONDS_PER_AUDIO_MINUTE,
+                        FORMAT_OUTPUT_TOKENS_PER_SECOND)
+from src.services.request_executor import ServiceError
+from src.services.youtube_service import MAX_IDS_PER_VIDEOS_REQUEST
+
+PAGE_SIZE = 50  # items per page of the list calls the extractors use
+
+
+class JobPlan:
+    """The estimated cost and duration of running an extractor."""
+
+    def __init__(self):
+        self.listed_videos = 0
+        self.source_videos = 0  # videos in the source, of which the run's listing may return fewer
+        self.listing_method = None
+        self.listing_cached = False  # planning cached the run's list pages
+        self.videos_in_period = 0
+        self.planned_videos = 0
+        self.audio_minutes = 0.0
+        self.sampled_videos = 0
+        self.sampled_without_captions = 0
+        self.asr_videos = 0
+        self.asr_audio_minutes = 0.0
+        self.format_input_tokens = 0
+        self.format_output_tokens = 0
+        self.api_units = {}  # YouTubeService method -> estimated quota units of the run
+        self.planning_api_units = 0
+        self.hours = {}  # scenario -> estimated wall-clock hours
+
+    @property
+    def total_api_units(self):
+        return sum(self.api_units.values())
+
+    def report(self):
+        """Returns the plan as printable text."""
+        sampled = "" if self.sampled_videos == self.planned_videos else f" (estimated from {self.sampled_videos} sampled)"
+        lines = []
+        if self.source_videos > self.listed_videos:
+            lines.append(f"⚠️ The source has {self.source_videos} videos, but YouTube search only returns the newest "
+                         f"{self.listed_videos} of them; the run and this estimate cover those only. "
+                         f"To get all of them, run the channel's uploads playlist instead (its id is the channel id with UC replaced by UU).")
+        lines += [
+            f"Videos in source: {self.listed_videos}, to process: {self.planned_videos} "
+            f"({self.audio_minutes / 60:.1f} hours of video)",
+            f"Without captions in any language: {self.asr_videos}{sampled}, {self.asr_audio_minutes:.0f} audio minutes needing AI transcription",
+            "YouTube Data API quota units:",
+        ]
+        for method, units in self.api_units.items():
+            lines.append(f"   - {method}: {units}")
+        lines.append(f"   Total: {self.total_api_units} "
+                     f"({self.total_api_units / YOUTUBE_DAILY_QUOTA_UNITS * 100:.0f}% of a {YOUTUBE_DAILY_QUOTA_UNITS}-unit daily quota)")
+        if self.total_api_units > YOUTUBE_DAILY_QUOTA_UNITS:
+            days = math.ceil(self.total_api_units / YOUTUBE_DAILY_QUOTA_UNITS)
+            lines.append(f"   ⚠️ This exceeds the daily quota; consider splitting the job into {days} date ranges.")
+        ttl_minutes = METADATA_CACHE_TTL_SECONDS / 60
+        if self.listing_cached:
+            lines.append(f"   Planning cached the {self.listing_method} pages: a run started within "
+                         f"{ttl_minutes:.0f} minutes lists them for 0 units.")
+        lines.append(f"   Requests cached in the last {ttl_minutes:.0f} minutes cost 0 units; the figures above assume none are.")
+        lines.append(f"AI formatting tokens (if enabled): ~{self.format_input_tokens:,} in, ~{self.format_output_tokens:,} out")
+        lines.append("Estimated duration:")
+        for scenario, hours in self.hours.items():
+            lines.append(f"   - {scenario}: {hours:.1f} hours")
+        lines.append(f"(Planning itself used {self.planning_api_units} quota units.)")
+        return "\n".join(lines)
+
+
+class JobPlanner:
+    """
+    Estimates what running a channel or playlist extractor will cost before anything is spent:
+    quota units per YouTubeService method, audio minutes needing ASR, Gemini formatting tokens
+    and wall-clock time. The source is enumerated with cheap calls (uploads playlist, batched
+    video details) and caption availability is checked on a sample of videos.
+    """
+
+    def __init__(self, extractor, caption_sample_size=PLAN_CAPTION_SAMPLE_SIZE, concurrency=PLAN_CONCURRENCY):
+        self.extractor = extractor
+        self.service = extractor.service
+        self.caption_sample_size = caption_sample_size
+        self.concurrency = max(1, concurrency)
+
+    def plan(self):
+        """Enumerates the source and returns a JobPlan. Raises a ServiceError if the source can't be listed."""
+        plan = JobPlan()
+        listed = list(self.extractor.planning_generator())
+        plan.source_videos = len(listed)
+        if self.extractor.LISTING_MAX_RESULTS is not None:
+            # Both listings are newest first, so the run sees the head of this one.
+            listed = listed[:self.extractor.LISTING_MAX_RESULTS]
+        plan.listed_videos = len(listed)
+        # Filtered on the listing's own dates, as video_generator() does during the run.
+        in_period = [video for video in listed if self.extractor.is_within_period(video)]
+        plan.videos_in_period = len(in_period)
+        details = self.service.get_videos_details([video['id'] for video in in_period])
+        listing_pages = max(1, math.ceil(plan.listed_videos / PAGE_SIZE))
+        planning_pages = max(1, math.ceil(plan.source_videos / PAGE_SIZE))
+        detail_batches = math.ceil(len(in_period) / MAX_IDS_PER_VIDEOS_REQUEST)
+        plan.planning_api_units = self.extractor.PLANNING_SETUP_QUOTA_COST + planning_pages + detail_batches
+        plan.listing_method = self.extractor.LISTING_METHOD
+        plan.listing_cached = self.extractor.PLANNING_SHARES_RUN_LISTING
+
+        videos = []
+        for video in in_period:
+            video_details = details.get(video['id'])
+            if video_details is None:
+                # Private or deleted. Without shorts the run skips it; with shorts it still tries it.
+                if self.extractor.include_shorts:
+                    videos.append({**video, 'duration': 0})
+            elif self.extractor.include_shorts or video_details['duration'] > MAX_SHORT_DURATION_SECONDS:
+                videos.append(video_details)
+        plan.planned_videos = len(videos)
+        plan.audio_minutes = sum(video['duration'] for video in videos) / 60
+
+        self._estimate_captions(plan, videos)
+        self._estimate_api_units(plan, listing_pages)
+        self._estimate_formatting(plan)
+        self._estimate_duration(plan)
+        return plan
+
+    def _estimate_captions(self, plan, videos):
+        if self.caption_sample_size is None or len(videos) <= self.caption_sample_size:
+            sample = videos
+        else:
+            sample = random.sample(videos, self.caption_sample_size)
+        checked, without_captions = [], []
+        for video in sample:
+            try:
+                transcript = self.service.find_transcript(video['id'])
+            except ServiceError:
+                continue  # unknown; leave it out of the sample
+            checked.append(video)
+            if transcript is None:
+                without_captions.append(video)
+        sample = checked
+        plan.sampled_videos = len(sample)
+        plan.sampled_without_captions = len(without_captions)
+        if not sample:
+            return
+        # Scale the sample up to all planned videos, by count and by audio length.
+        sample_minutes = sum(video['duration'] for video in sample) / 60
+        missing_minutes = sum(video['duration'] for video in without_captions) / 60
+        plan.asr_videos = round(len(without_captions) / len(sample) * plan.planned_videos)
+        plan.asr_audio_minutes = missing_minutes / sample_minutes * plan.audio_minutes if sample_minutes else 0.0
+
+    def _estimate_api_units(self, plan, listing_pages):
+        plan.api_units[self.extractor.LISTING_METHOD] = listing_pages * self.extractor.PAGE_QUOTA_COST
+        # Without shorts, every video in the period gets its own videos.list call to check its duration.
+        plan.api_units['get_video_details'] = 0 if self.extractor.include_shorts else plan.videos_in_period
+        plan.api_units['get_transcript'] = 0  # captions are not served by the Data API
+
+    def _estimate_formatting(self, plan):
+        transcript_tokens = plan.audio_minutes * SPEECH_WORDS_PER_MINUTE * TOKENS_PER_WORD
+        plan.format_input_tokens = round(transcript_tokens + plan.planned_videos * FORMAT_PROMPT_TOKENS)
+        plan.format_output_tokens = round(transcript_tokens)
+
+    def _estimate_duration(self, plan):
+        base = plan.planned_videos * SECONDS_PER_TRANSCRIPT_FETCH
+        asr = plan.asr_audio_minutes * ASR_SECONDS_PER_AUDIO_MINUTE
+        formatting = plan.format_output_tokens / FORMAT_OUTPUT_TOKENS_PER_SECOND
+
+        def hours(seconds):
+            return seconds / self.concurrency / 3600
+
+        plan.hours['captions only'] = hours(base)
+        plan.hours['with AI transcription'] = hours(base + asr)
+        plan.hours['with AI transcription and formatting'] = hours(base + asr + formatting)
@@ -15,4 +15,8 @@ class PlaylistExtractor(Extractor):
         """Yields valid videos from the playlist sequentially."""
         for video_data in self.service.fetch_playlist_videos_sequentially(self.playlist_id):
             if self._is_video_valid(video_data):
-                yield video_data
\ No newline at end of file
+                yield video_data
+
+    def planning_generator(self):
+        """Yields the playlist's videos; the playlist listing is already the cheapest source."""
+        yield from self.service.fetch_playlist_videos_sequentially(self.playlist_id)
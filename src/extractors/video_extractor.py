@@ -1,3 +1,14 @@
+import re
+
+# Cells of a CSV export or pasted spreadsheet row are separated by commas, semicolons or tabs.
+# Spaces are not separators: they occur inside free-text cells such as titles.
+CELL_SEPARATOR_RE = re.compile(r'[,;\t]')
+BARE_VIDEO_ID_RE = re.compile(r'[0-9A-Za-z_-]{11}')
+# YouTube URL forms that point at a single video. Channel, handle and playlist URLs don't match, so
+# their path segments (e.g. /channel/UC...) are never read as video ids.
+VIDEO_URL_RE = re.compile(r'youtu\.be/|[?&]v=|/(?:shorts|embed|live|v)/')
+
+
 class VideoExtractor:
     """
     A simple utility to retrieve and validate data for a single YouTube video URL.
@@ -8,9 +19,72 @@ class VideoExtractor:
 
     def get_video(self, video_url):
         """Retrieves and validates data for a single video URL."""
-        video_id = self.service.get_video_id_from_url(video_url)
+        video_id = self._video_id_from_url(video_url)
         if not video_id:
             print("Error: Could not extract a valid Video ID from the URL.")
             return None
 
-        return self.service.get_video_details(video_id)
\ No newline at end of file
+        return self.service.get_video_details(video_id)
+
+    def get_videos(self, lines):
+        """
+        Resolves many video URLs at once, e.g. the lines of a file. Ids are de-duplicated and their
+        details fetched in batches of 50.
+
+        Returns (videos, invalid_entries, unavailable_ids): the videos in input order, the entries
+        no video ID could be parsed from, and the ids from video URLs that are private or do not exist.
+        A cell that only looks like a bare id (a header such as "Description", a one-word title) and
+        matches no video is reported with its line among the invalid entries instead.
+        """
+        video_ids = []
+        seen = set()
+        url_ids = set()
+        bare_id_lines = {}  # bare id -> the first line it was read from
+        invalid_entries = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            line_url_ids, line_bare_ids = self._parse_video_ids(line)
+            if not line_url_ids and not line_bare_ids:
+                invalid_entries.append(line)
+            url_ids.update(line_url_ids)
+            for video_id in line_bare_ids:
+                bare_id_lines.setdefault(video_id, line)
+            for video_id in line_url_ids + line_bare_ids:
+                if video_id not in seen:
+                    seen.add(video_id)
+                    video_ids.append(video_id)
+
+        details = self.service.get_videos_details(video_ids)
+        videos = [details[video_id] for video_id in video_ids if video_id in details]
+        unavailable_ids = [video_id for video_id in video_ids if video_id not in details and video_id in url_ids]
+        for video_id in video_ids:
+            line = bare_id_lines.get(video_id)
+            if video_id not in details and video_id not in url_ids and line not in invalid_entries:
+                invalid_entries.append(line)
+        return videos, invalid_entries, unavailable_ids
+
+    def _parse_video_ids(self, line):
+        """
+        Extracts (url_ids, bare_ids) from one line, which may hold several cells. A cell that
+        mentions youtu(.be) is parsed for video URLs only; any other cell that is exactly 11 id
+        characters is a bare id candidate. Candidates may still be words, so get_videos() checks them.
+        """
+        url_ids, bare_ids = [], []
+        for cell in CELL_SEPARATOR_RE.split(line):
+            cell = cell.strip().strip('"\'').strip()
+            if 'youtu' in cell:
+                for token in cell.split():
+                    video_id = self._video_id_from_url(token) if 'youtu' in token else None
+                    if video_id:
+                        url_ids.append(video_id)
+            elif BARE_VIDEO_ID_RE.fullmatch(cell):
+                bare_ids.append(cell)
+        return url_ids, bare_ids
+
+    def _video_id_from_url(self, url):
+        """Returns the video id of a video URL, or None for other YouTube URLs (channels, playlists)."""
+        if not VIDEO_URL_RE.search(url):
+            return None
+        return self.service.get_video_id_from_url(url)
@@ -1,9 +1,12 @@
 import os
 import shutil
+import tempfile
 import yt_dlp
 import google.generativeai as genai
 from huggingface_hub import InferenceClient
-from src.config import GOOGLE_AI_API_KEY, HF_API_KEY, HF_ASR_MODEL, GEMINI_MODEL_NAME
+from src.config import (GOOGLE_AI_API_KEY, HF_API_KEY, HF_ASR_MODEL, GEMINI_MODEL_NAME, REQUEST_TIMEOUT_SECONDS,
+                        AI_REQUEST_TIMEOUT_SECONDS)
+from src.services.request_executor import RequestExecutor, ServiceError
 
 
 class AIService:
@@ -22,75 +25,77 @@ class AIService:
             self.hf_client = InferenceClient(
                 provider="hf-inference",
                 api_key=HF_API_KEY,
-                headers={"Content-Type": "audio/webm;codecs=opus"}
+                headers={"Content-Type": "audio/webm;codecs=opus"},
+                timeout=AI_REQUEST_TIMEOUT_SECONDS
             )
 
+        self.gemini_executor = RequestExecutor('gemini', timeout=AI_REQUEST_TIMEOUT_SECONDS)
+        # The Hugging Face client and yt-dlp enforce their own timeouts, so no call is left running in
+        # the background. A timed-out upload or download is not retried.
+        self.hf_executor = RequestExecutor('huggingface', timeout=None, retry_timeouts=False)
+        self.download_executor = RequestExecutor('yt-dlp', timeout=None, retry_timeouts=False)
+
     def transcribe_audio_hf(self, youtube_url):
         """
         Downloads audio from a YouTube URL and transcribes it using Hugging Face's Inference API.
+        Returns None if transcription is not configured; raises a ServiceError if it fails.
         """
         if not self.hf_client:
             print("Cannot transcribe: Hugging Face client is not configured.")
             return None
 
-        audio_path, save_dir = self._download_audio(youtube_url)
-        if not audio_path:
-            return None
-
+        # A directory per call, so one video's audio can never be picked up for another.
+        save_dir = tempfile.mkdtemp(prefix='yt_captions_audio_')
         try:
+            audio_path = self.download_executor.execute(self._download_audio, youtube_url, save_dir)
+            if not audio_path:
+                raise ServiceError('yt-dlp', f"No audio file was produced for {youtube_url}.")
+
             with open(audio_path, "rb") as f:
                 audio_bytes = f.read()
 
-            transcription = self.hf_client.automatic_speech_recognition(
+            transcription = self.hf_executor.execute(
+                self.hf_client.automatic_speech_recognition,
                 audio_bytes,
                 model=HF_ASR_MODEL
             )
             return transcription.get("text", None)
-
-
-        except Exception as e:
-            print(f"Error during transcription with Hugging Face: {e}")
-            return None
         finally:
             # Clean up the temporary audio files
-            if save_dir and os.path.exists(save_dir):
-                shutil.rmtree(save_dir)
-
-
-    def _download_audio(self, url):
-        """Downloads the audio track of a YouTube video to a temporary location."""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            save_path = os.path.join(current_dir, 'audio_temp')
-            os.makedirs(save_path, exist_ok=True)
-            ydl_opts = {
-                'format': 'bestaudio/best',
-                'outtmpl': os.path.join(save_path, 'audio.%(ext)s'),
-                'noplaylist': True,
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'opus',
-                }],
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                base_path = ydl.prepare_filename(info).rsplit('.', 1)[0]
-                final_path = base_path + '.opus'
-
-            if os.path.exists(final_path):
-                return final_path, save_path
-
-            # Fallback if the path logic fails for some reason
-            if os.path.exists(base_path + '.webm'):
-                return base_path + '.webm', save_path
-
-            return None, save_path
-        except Exception as e:
-            print(f"Error downloading audio: {e}")
-            return None, None
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+
+    def _download_audio(self, url, save_path):
+        """Downloads the audio track of a YouTube video into save_path. Returns the file path, or None."""
+        ydl_opts = {
+            'format': 'bestaudio/best',
+            'outtmpl': os.path.join(save_path, 'audio.%(ext)s'),
+            'noplaylist': True,
+            'socket_timeout': REQUEST_TIMEOUT_SECONDS,
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'opus',
+            }],
+        }
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            base_path = ydl.prepare_filename(info).rsplit('.', 1)[0]
+            final_path = base_path + '.opus'
+
+        if os.path.exists(final_path):
+            return final_path
+
+        # Fallback if the path logic fails for some reason
+        if os.path.exists(base_path + '.webm'):
+            return base_path + '.webm'
+
+        return None
 
     def format_text_gemini(self, text_to_format):
-        """Uses Google's Gemini model to format text."""
+        """
+        Uses Google's Gemini model to format text.
+        Returns None if formatting is not configured; raises a ServiceError if it fails.
+        """
         if not self.gemini_model:
             print("AI formatting skipped: Google AI API key not configured.")
             return None
@@ -103,9 +108,5 @@ Original Text:
 {text_to_format}
 ---
 """
-        try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            print(f"Error with Gemini formatting: {e}")
-            return None
\ No newline at end of file
+        # Reading .text raises if the response was blocked, so it happens inside the executor too.
+        return self.gemini_executor.execute(lambda: self.gemini_model.generate_content(prompt).text)
\ No newline at end of file
@@ -1,9 +1,15 @@
+import io
 import os
 import docx
+import zipfile
+import httplib2
 import googleapiclient.discovery
+from google_auth_httplib2 import AuthorizedHttp
 from abc import ABC, abstractmethod
 from google.oauth2.service_account import Credentials
-from src.config import GOOGLE_DOCS_CREDENTIALS_PATH
+from src.config import GOOGLE_DOCS_CREDENTIALS_PATH, REQUEST_TIMEOUT_SECONDS
+from src.services.request_executor import RequestExecutor, ServiceError
+from src.services.transcript_normalizer import strip_xml_invalid
 
 
 class DocWriter(ABC):
@@ -26,6 +32,12 @@ class GoogleDocsWriter(DocWriter):
     def __init__(self, doc_link):
         self.doc_id = self._get_doc_id(doc_link)
         self.doc_service = self._authenticate()
+        # The Http built in _authenticate has a socket timeout; httplib2 is not thread-safe, so the
+        # executors don't add a thread-based one.
+        self.executor = RequestExecutor('google-docs', timeout=None)
+        # Inserting text is not idempotent, so writes get their own executor sharing the same breaker.
+        self.write_executor = RequestExecutor('google-docs', timeout=None, breaker=self.executor.breaker,
+                                              idempotent=False)
         if not self.doc_id:
             raise ValueError("Invalid Google Doc link. Could not extract Document ID.")
         if not self.doc_service:
@@ -33,9 +45,9 @@ class GoogleDocsWriter(DocWriter):
 
         # Test the connection and permissions
         try:
-            self.doc_service.documents().get(documentId=self.doc_id).execute()
+            self.executor.execute(self.doc_service.documents().get(documentId=self.doc_id).execute)
             print("Successfully connected to Google Docs.")
-        except Exception as e:
+        except ServiceError as e:
             raise ValueError(f"Cannot access Google Doc. Check link and permissions. Error: {e}")
 
     def _get_doc_id(self, link):
@@ -49,7 +61,8 @@ class GoogleDocsWriter(DocWriter):
         try:
             scope = ['https://www.googleapis.com/auth/documents', 'https://www.googleapis.com/auth/drive']
             creds = Credentials.from_service_account_file(GOOGLE_DOCS_CREDENTIALS_PATH, scopes=scope)
-            return googleapiclient.discovery.build('docs', 'v1', credentials=creds)
+            http = AuthorizedHttp(creds, http=httplib2.Http(timeout=REQUEST_TIMEOUT_SECONDS))
+            return googleapiclient.discovery.build('docs', 'v1', http=http)
         except Exception as e:
             print(f"Error authenticating with Google Docs API: {e}")
             return None
@@ -128,10 +141,10 @@ class GoogleDocsWriter(DocWriter):
         ]
 
         try:
-            self.doc_service.documents().batchUpdate(
+            self.write_executor.execute(self.doc_service.documents().batchUpdate(
                 documentId=self.doc_id, body={'requests': requests}
-            ).execute()
-        except Exception as e:
+            ).execute)
+        except ServiceError as e:
             if 'INVALID_ARGUMENT' in str(e) and 'exceeds the maximum' in str(e):
                 print(f"Warning: Content for '{title}' is too long for a single Google Docs request and was skipped.")
             else:
@@ -152,26 +165,118 @@ class MSWordWriter(DocWriter):
         """Appends a formatted title and content to the Word document."""
         try:
             # Filter out invalid XML characters that can crash python-docx
-            clean_content = "".join(c for c in content if c.isprintable() or c in ('\n', '\t', '\r'))
-            self.doc.add_heading(title, level=1)
-            self.doc.add_paragraph(clean_content)
+            self.doc.add_heading(strip_xml_invalid(title), level=1)
+            self.doc.add_paragraph(strip_xml_invalid(content))
             self.doc.add_paragraph()  # Add a little space between entries
         except Exception as e:
             print(f"Error adding content for video '{title}' to Word doc: {e}")
 
     def save(self):
         """Saves the document to the specified path, avoiding overwrites."""
-        base_filename = "YT_Captions.docx"
-        doc_filename = base_filename
-        count = 0
+        full_path = _available_docx_path(self.storage_path)
+        try:
+            self.doc.save(full_path)
+            print(f"\n📁 Saved results to {full_path}")
+        except Exception as e:
+            print(f"Error saving Word document: {e}")
+
+
+class StreamingWordWriter(DocWriter):
+    """
+    Writes transcription data to a Microsoft Word (.docx) file by streaming the document XML
+    straight into the zip archive as videos arrive, so memory use does not grow with the document.
 
-        while os.path.exists(os.path.join(self.storage_path, doc_filename)):
-            count += 1
-            doc_filename = f"YT_Captions ({count}).docx"
+    Everything except the document body (styles, theme, settings, page setup) is copied from
+    python-docx's default template, so the output looks the same as MSWordWriter's.
+    """
 
-        full_path = os.path.join(self.storage_path, doc_filename)
+    DOCUMENT_PART = 'word/document.xml'
+
+    def __init__(self, storage_path, template_path=None):
+        self.storage_path = storage_path
+        self.template_path = template_path or _DEFAULT_DOCX_TEMPLATE
+        self._part_path = os.path.join(storage_path, f".YT_Captions-{os.getpid()}.docx.part")
+        self._zip = None
+        self._document = None
+
+    def _open(self):
+        # Deferred to the first write, so a writer that is never used leaves no file behind.
+        self._zip = zipfile.ZipFile(self._part_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        with zipfile.ZipFile(self.template_path) as template:
+            for info in template.infolist():
+                if info.filename != self.DOCUMENT_PART:
+                    self._zip.writestr(info, template.read(info))
+            template_xml = template.read(self.DOCUMENT_PART).decode('utf-8')
+
+        # Keep the template's root element (namespace declarations) and its section properties.
+        body_start = template_xml.index('<w:body>') + len('<w:body>')
+        self._document_end = template_xml[template_xml.index('<w:sectPr'):]
+        self._document = io.TextIOWrapper(
+            self._zip.open(self.DOCUMENT_PART, 'w', force_zip64=True), encoding='utf-8'
+        )
+        self._document.write(template_xml[:body_start])
+
+    def write_video(self, title, content):
+        """Appends a Heading 1 title, the content and a blank spacer paragraph to the document."""
         try:
-            self.doc.save(full_path)
+            if not self._document:
+                self._open()
+            self._document.write(
+                f'<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr>{_run_xml(title)}</w:p>'
+                f'<w:p>{_run_xml(content)}</w:p>'
+                '<w:p/>'
+            )
+        except Exception as e:
+            print(f"Error adding content for video '{title}' to Word doc: {e}")
+
+    def save(self):
+        """Finishes the archive and moves it to the specified path, avoiding overwrites."""
+        try:
+            if not self._document:
+                self._open()
+            self._document.write(self._document_end)
+            self._document.close()
+            self._zip.close()
+            full_path = _available_docx_path(self.storage_path)
+            os.replace(self._part_path, full_path)
             print(f"\n📁 Saved results to {full_path}")
         except Exception as e:
-            print(f"Error saving Word document: {e}")
\ No newline at end of file
+            print(f"Error saving Word document: {e}")
+
+
+# python-docx's Document() starts from this file; StreamingWordWriter reuses its styles and page setup.
+_DEFAULT_DOCX_TEMPLATE = os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx')
+
+# Matches python-docx, which turns tabs into <w:tab/> and each \r or \n into a <w:br/> when setting run text.
+# Applied in order with str.replace, which is much faster than str.translate for multi-character output.
+_RUN_TEXT_REPLACEMENTS = (
+    ('&', '&amp;'),
+    ('<', '&lt;'),
+    ('>', '&gt;'),
+    ('\t', '</w:t><w:tab/><w:t xml:space="preserve">'),
+    ('\r', '</w:t><w:br/><w:t xml:space="preserve">'),
+    ('\n', '</w:t><w:br/><w:t xml:space="preserve">'),
+)
+
+
+def _run_xml(text):
+    """Builds a single <w:r> run holding text, the way python-docx's add_paragraph/add_heading do."""
+    if not text:
+        return ''
+    text = strip_xml_invalid(text)
+    for char, replacement in _RUN_TEXT_REPLACEMENTS:
+        text = text.replace(char, replacement)
+    return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def _available_docx_path(storage_path):
+    """Returns a YT_Captions .docx path in storage_path that does not overwrite an existing file."""
+    base_filename = "YT_Captions.docx"
+    doc_filename = base_filename
+    count = 0
+
+    while os.path.exists(os.path.join(storage_path, doc_filename)):
+        count += 1
+        doc_filename = f"YT_Captions ({count}).docx"
+
+    return os.path.join(storage_path, doc_filename)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from src.config import METADATA_CACHE_PATH, METADATA_CACHE_TTL_SECONDS, METADATA_CACHE_MAX_AGE_SECONDS
+
+
+class MetadataCache:
+    """
+    A local SQLite cache of YouTube Data API responses keyed by request URL.
+
+    Entries younger than `ttl` are served without a request. Older entries are revalidated with
+    their ETag; a 304 answer means the cached body is still current and only refreshes the entry.
+    Entries not revalidated for `max_age` seconds are dropped when the cache is opened.
+    Each store or revalidation writes only its own row, so a run's disk I/O stays linear.
+    """
+
+    def __init__(self, path=METADATA_CACHE_PATH, ttl=METADATA_CACHE_TTL_SECONDS, max_age=METADATA_CACHE_MAX_AGE_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0}
+        # Shared with the page-prefetch thread, so the connection is guarded by a lock.
+        self._lock = threading.Lock()
+        self._db = self._open()
+
+    @staticmethod
+    def key_for(uri):
+        """Builds a cache key from a request URI, leaving out the API key."""
+        parts = urlsplit(uri)
+        query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if k != 'key'))
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+    def lookup(self, key):
+        """Returns (body, etag, is_fresh) for a cached entry, or (None, None, False) if there is none."""
+        row = self._query('SELECT body, etag, validated_at FROM entries WHERE key = ?', (key,))
+        if not row:
+            return None, None, False
+        body, etag, validated_at = row
+        return json.loads(body), etag, time.time() - validated_at < self.ttl
+
+    def record_hit(self):
+        with self._lock:
+            self.stats['hits'] += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.stats['misses'] += 1
+
+    def revalidate(self, key):
+        """Marks a cached entry as current after the server answered 304 Not Modified."""
+        self._write('UPDATE entries SET validated_at = ? WHERE key = ?', (time.time(), key))
+        with self._lock:
+            self.stats['revalidated'] += 1
+
+    def store(self, key, body):
+        self._write('INSERT OR REPLACE INTO entries (key, etag, body, validated_at) VALUES (?, ?, ?, ?)',
+                    (key, body.get('etag'), json.dumps(body), time.time()))
+        with self._lock:
+            self.stats['stores'] += 1
+
+    def summary(self):
+        s = self.stats
+        served = s['hits'] + s['revalidated']
+        total = served + s['misses']
+        rate = (served / total * 100) if total else 0
+        return (f"{served}/{total} metadata requests served from cache ({rate:.0f}%): "
+                f"{s['hits']} fresh, {s['revalidated']} revalidated (304), {s['misses']} downloaded.")
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL with normal sync keeps per-row commits cheap without risking corruption.
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS entries '
+                       '(key TEXT PRIMARY KEY, etag TEXT, body TEXT NOT NULL, validated_at REAL NOT NULL)')
+            db.execute('DELETE FROM entries WHERE validated_at < ?', (time.time() - self.max_age,))
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Metadata cache at {self.path} is unavailable, continuing without it: {e}")
+            return None
+
+    def _query(self, sql, params):
+        if not self._db:
+            return None
+        with self._lock:
+            try:
+                return self._db.execute(sql, params).fetchone()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not read metadata cache: {e}")
+                return None
+
+    def _write(self, sql, params):
+        if not self._db:
+            return
+        with self._lock:
+            try:
+                with self._db:  # commits, or rolls back on error
+                    self._db.execute(sql, params)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not update metadata cache: {e}")
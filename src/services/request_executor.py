@@ -0,0 +1,252 @@
+import http.client
+import importlib
+import random
+import socket
+import ssl
+import threading
+import time
+from src.config import (REQUEST_TIMEOUT_SECONDS, REQUEST_MAX_RETRIES, REQUEST_BACKOFF_BASE_SECONDS,
+                        REQUEST_BACKOFF_MAX_SECONDS, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+
+# HTTP statuses that are worth retrying: timeouts, rate limiting and server-side failures.
+TRANSIENT_HTTP_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _optional_exceptions(*paths):
+    """Resolves 'module.ExceptionName' paths, skipping libraries that are not installed."""
+    found = []
+    for path in paths:
+        module_name, name = path.rsplit('.', 1)
+        try:
+            found.append(getattr(importlib.import_module(module_name), name))
+        except (ImportError, AttributeError):
+            continue
+    return tuple(found)
+
+
+# Network-level failures. The client libraries' own connection and timeout errors don't all derive
+# from the builtin ConnectionError/TimeoutError (requests' derive from OSError, httplib2's from
+# HttpLib2Error), so they are listed explicitly.
+TRANSIENT_EXCEPTIONS = (
+    ConnectionError, TimeoutError, socket.gaierror, http.client.HTTPException, ssl.SSLError,
+) + _optional_exceptions(
+    'requests.exceptions.ConnectionError',
+    'requests.exceptions.Timeout',
+    'requests.exceptions.ChunkedEncodingError',
+    'httplib2.ServerNotFoundError',
+    'httpx.TransportError',
+)
+
+# Timeouts raised by the clients themselves (socket.timeout is TimeoutError; huggingface_hub's
+# InferenceTimeoutError derives from it too).
+TIMEOUT_EXCEPTIONS = (TimeoutError,) + _optional_exceptions(
+    'requests.exceptions.Timeout',
+    'httpx.TimeoutException',
+)
+
+
+class ServiceError(Exception):
+    """Base class for failures of an external backend call."""
+
+    def __init__(self, backend, message, status=None):
+        super().__init__(f"[{backend}] {message}")
+        self.backend = backend
+        self.status = status
+
+
+class TransientServiceError(ServiceError):
+    """The call failed for a reason that may go away on retry (network, 429, 5xx)."""
+
+
+class PermanentServiceError(ServiceError):
+    """The call failed for a reason a retry will not fix (bad request, not found, forbidden)."""
+
+
+class ServiceTimeoutError(TransientServiceError):
+    """The call did not finish within the configured timeout."""
+
+
+class CircuitOpenError(ServiceError):
+    """The backend's circuit breaker is open, so the call was not attempted."""
+
+    def __init__(self, backend, message, retry_after=0.0):
+        super().__init__(backend, message)
+        self.retry_after = retry_after  # seconds until the breaker lets a trial call through
+
+
+def _http_status(exc):
+    """Extracts an HTTP status code from the exception types raised by the client libraries we use."""
+    # googleapiclient.errors.HttpError keeps it on .resp.status, requests/huggingface_hub on
+    # .response.status_code, and google.api_core (Gemini) exceptions on .code.
+    candidates = (
+        getattr(getattr(exc, 'resp', None), 'status', None),
+        getattr(getattr(exc, 'response', None), 'status_code', None),
+        getattr(exc, 'status_code', None),
+        getattr(exc, 'code', None),
+    )
+    for status in candidates:
+        try:
+            return int(status)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def classify_error(backend, exc, transient=()):
+    """
+    Wraps an arbitrary client exception into a typed ServiceError.
+    `transient` adds exception types that are always worth a retry (e.g. a library's rate-limit error).
+    """
+    if isinstance(exc, ServiceError):
+        return exc
+    status = _http_status(exc)
+    message = f"{type(exc).__name__}: {exc}"
+    if isinstance(exc, tuple(transient)) or status in TRANSIENT_HTTP_STATUSES or (
+            status is None and isinstance(exc, TRANSIENT_EXCEPTIONS)):
+        return TransientServiceError(backend, message, status)
+    return PermanentServiceError(backend, message, status)
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failed calls of one backend, each counted once after its retries are used up.
+    After `failure_threshold` failures the circuit opens and calls fail fast; after `reset_timeout`
+    seconds a single trial call is let through, which closes the circuit on success or re-opens it
+    on failure.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def retry_after(self):
+        """Seconds until the breaker will allow a trial call again."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RequestExecutor:
+    """
+    Runs calls against one external backend with a per-call timeout, jittered exponential
+    retries for transient errors and a circuit breaker. Every failure surfaces as a ServiceError.
+
+    The timeout runs the call on a worker thread that is abandoned if it overruns. Pass timeout=None
+    when the client has socket-level timeouts of its own, and always for calls that write files or
+    hold expensive resources, since an abandoned call keeps running.
+    """
+
+    def __init__(self, backend, timeout=REQUEST_TIMEOUT_SECONDS, max_retries=REQUEST_MAX_RETRIES,
+                 backoff_base=REQUEST_BACKOFF_BASE_SECONDS, backoff_max=REQUEST_BACKOFF_MAX_SECONDS,
+                 breaker=None, passthrough=(), transient=(), idempotent=True, retry_timeouts=True):
+        self.backend = backend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        # Exceptions that signal an expected outcome (e.g. "no captions") rather than a failure.
+        # They are re-raised unchanged and do not count against the breaker.
+        self.passthrough = tuple(passthrough)
+        # Library-specific exceptions that signal throttling or a failed request, retried like a 5xx.
+        self.transient = tuple(transient)
+        # Non-idempotent calls are only retried when the backend answered with a retryable status;
+        # after a timeout or dropped connection we can't tell whether the call was applied.
+        self.idempotent = idempotent
+        # Long-running calls (large uploads, downloads) that time out would most likely time out
+        # again, so retrying them only multiplies the wait.
+        self.retry_timeouts = retry_timeouts
+
+    def execute(self, func, *args, **kwargs):
+        """Calls func(*args, **kwargs), retrying transient failures. Raises a ServiceError on failure."""
+        if not self.breaker.allow_request():
+            retry_after = self.breaker.retry_after()
+            raise CircuitOpenError(self.backend, f"Backend is unavailable; retrying in {retry_after:.0f}s.",
+                                   retry_after)
+        # The breaker is checked once per call, not per attempt: retries of one call are a single
+        # failure, so one unlucky call can't open the circuit on its own.
+        attempt = 0
+        while True:
+            try:
+                result = self._call_with_timeout(func, args, kwargs)
+            except self.passthrough:
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                error = classify_error(self.backend, e, self.transient)
+                if not isinstance(error, TransientServiceError):
+                    # The backend answered; the request itself is bad. Don't hold it against the backend.
+                    self.breaker.record_success()
+                    raise error from (None if error is e else e)
+                if (attempt >= self.max_retries or (not self.idempotent and error.status is None)
+                        or (not self.retry_timeouts and self._is_timeout(e))):
+                    self.breaker.record_failure()
+                    raise error from (None if error is e else e)
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                print(f"Warning: {error} Retrying in {delay:.1f}s (attempt {attempt}/{self.max_retries})...")
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    @staticmethod
+    def _is_timeout(exc):
+        return isinstance(exc, (ServiceTimeoutError,) + TIMEOUT_EXCEPTIONS)
+
+    def _backoff_delay(self, attempt):
+        # "Full jitter": spreads retries out so they don't arrive at the backend in lockstep.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _call_with_timeout(self, func, args, kwargs):
+        # timeout=None is for clients that enforce their own socket timeouts. Clients that are not
+        # thread-safe (httplib2) must use that, since a timed-out call below keeps using its connection.
+        if not self.timeout:
+            return func(*args, **kwargs)
+
+        outcome = {}
+
+        def target():
+            try:
+                outcome['result'] = func(*args, **kwargs)
+            except BaseException as e:
+                outcome['error'] = e
+
+        # A daemon thread so that a call which never returns cannot keep the program alive.
+        # The abandoned call keeps running in the background; its result is discarded.
+        worker = threading.Thread(target=target, name=f"{self.backend}-request", daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            raise ServiceTimeoutError(self.backend, f"Call did not complete within {self.timeout}s.")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
@@ -0,0 +1,67 @@
+import re
+
+# Characters XML 1.0 does not allow. python-docx (lxml) refuses to write them.
+XML_INVALID_CHARS = r'\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff'
+XML_INVALID_RE = re.compile(f'[{XML_INVALID_CHARS}]')
+
+# Bracketed tags YouTube and Whisper use for non-speech sounds, plus the [ __ ] profanity mask.
+# Only these are removed: other bracketed text ("array[0]", "[citation needed]") can be real content.
+NON_SPEECH_TAGS = (
+    'music', 'applause', 'laughter', 'laughing', 'laughs', 'cheering', 'cheers', 'clapping',
+    'inaudible', 'silence', 'noise', 'foreign', 'sound', '__',
+)
+
+# Non-speech noise in captions: the tags above, music notes, and the ">>" speaker-change marker.
+# Matched in the same pass as XML-invalid characters.
+NOISE_RE = re.compile(
+    rf'\[\s*(?:{"|".join(NON_SPEECH_TAGS)})\s*\]|[♪♫]+|>>|[{XML_INVALID_CHARS}]', re.IGNORECASE
+)
+
+# Rolling auto-captions repeat the tail of one caption line at the start of the next one, while
+# both are on screen. Shorter shared runs ("thank you / thank you very much") are left alone, since
+# they are as likely to be real speech as a rolling repeat.
+MIN_OVERLAP_WORDS = 3
+
+# Strips surrounding punctuation so "you," and "you" compare equal when detecting overlaps.
+_PUNCTUATION = '.,!?;:"\'()-…'
+
+
+def strip_xml_invalid(text):
+    """Removes characters that cannot be stored in an XML (e.g. .docx) document."""
+    return XML_INVALID_RE.sub('', text)
+
+
+def normalize_transcript(text):
+    """
+    Cleans a raw transcript before it is formatted or written: removes non-speech tags and
+    XML-invalid characters and collapses whitespace. The words themselves are left untouched.
+    """
+    if not text:
+        return text
+    return ' '.join(NOISE_RE.sub(' ', text).split())
+
+
+def merge_caption_snippets(snippets):
+    """
+    Joins the text of consecutive auto-generated caption snippets ({'text', 'start', 'duration'}
+    dicts, as from FetchedTranscript.to_raw_data()), dropping the words at the start of a snippet
+    that repeat the end of the previous one while that one is still on screen. Only meant for
+    auto-generated tracks; manual captions don't roll, and a repeat there is real speech.
+    """
+    merged = []
+    previous_keys = []
+    previous_end = None
+    for snippet in snippets:
+        words = snippet['text'].split()
+        keys = [word.strip(_PUNCTUATION).casefold() for word in words]
+        overlap = 0
+        if previous_end is not None and snippet['start'] < previous_end:
+            # Longest suffix of the previous snippet that is also a prefix of this one.
+            for n in range(min(len(previous_keys), len(keys)), MIN_OVERLAP_WORDS - 1, -1):
+                if previous_keys[-n:] == keys[:n]:
+                    overlap = n
+                    break
+        merged.extend(words[overlap:])
+        previous_keys = keys
+        previous_end = snippet['start'] + snippet['duration']
+    return ' '.join(merged)
@@ -1,9 +1,40 @@
 import re
+import queue
 import datetime
+import threading
+from collections import OrderedDict
+import httplib2
 import isodate
 import googleapiclient.discovery
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, CouldNotRetrieveTranscript, NoTranscriptFound
-from src.config import YOUTUBE_DATA_API_KEY
+import youtube_transcript_api
+from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
+from src.config import YOUTUBE_DATA_API_KEY, REQUEST_TIMEOUT_SECONDS, PAGE_PREFETCH_DEPTH, TRANSCRIPT_LANGUAGES, TRANSCRIPT_LIST_CACHE_SIZE
+from src.services.request_executor import RequestExecutor, ServiceError, PermanentServiceError
+from src.services.metadata_cache import MetadataCache
+from src.services.transcript_normalizer import merge_caption_snippets
+
+VIDEO_ID_PATTERNS = (
+    re.compile(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*'),
+    re.compile(r'(?:youtu\.be\/|shorts\/)([0-9A-Za-z_-]{11})'),
+)
+PLAYLIST_ID_PATTERN = re.compile(r'list=([^&]*)')
+MAX_IDS_PER_VIDEOS_REQUEST = 50  # videos.list accepts at most 50 comma-separated ids
+
+
+def _transcript_errors(*names):
+    # The exception names differ between youtube-transcript-api releases; use those that exist.
+    return tuple(getattr(youtube_transcript_api, name) for name in names if hasattr(youtube_transcript_api, name))
+
+
+# Definitive answers that a video has no usable captions. Not failures, so they are not retried.
+NO_CAPTIONS_ERRORS = _transcript_errors(
+    'TranscriptsDisabled', 'NoTranscriptFound', 'NoTranscriptAvailable', 'VideoUnavailable', 'InvalidVideoId',
+    'AgeRestricted', 'VideoUnplayable', 'NotTranslatable', 'TranslationLanguageNotAvailable',
+)
+# Throttling and failed requests (subclasses of CouldNotRetrieveTranscript too). Worth a retry.
+TRANSIENT_TRANSCRIPT_ERRORS = _transcript_errors(
+    'TooManyRequests', 'YouTubeRequestFailed', 'RequestBlocked', 'IpBlocked',
+)
 
 
 class YouTubeService:
@@ -11,54 +42,93 @@ class YouTubeService:
         if not YOUTUBE_DATA_API_KEY:
             raise ValueError("YouTube Data API key not found in config.")
         try:
-            self.api = googleapiclient.discovery.build('youtube', 'v3', developerKey=YOUTUBE_DATA_API_KEY)
+            self.api = googleapiclient.discovery.build(
+                'youtube', 'v3', developerKey=YOUTUBE_DATA_API_KEY, http=httplib2.Http(timeout=REQUEST_TIMEOUT_SECONDS)
+            )
             print("Successfully authenticated with YouTube Data API.")
         except Exception as e:
             raise ConnectionError(f"Failed to authenticate YouTube Data API: {e}")
+        # httplib2 is not thread-safe, so the socket timeout on self.api's Http replaces the executor's.
+        self.api_executor = RequestExecutor('youtube-data-api', timeout=None)
+        self.metadata_cache = MetadataCache()
+        self.transcript_executor = RequestExecutor(
+            'youtube-transcript', passthrough=NO_CAPTIONS_ERRORS, transient=TRANSIENT_TRANSCRIPT_ERRORS
+        )
+        self.transcript_api = YouTubeTranscriptApi()
+        self._transcript_lists = OrderedDict()  # video id -> TranscriptList, least recently used first
 
     def check_channel_id(self, channel_id):
         try:
             request = self.api.channels().list(part="snippet", id=channel_id)
-            response = request.execute()
+            response = self._execute_cached(request)
             return 'items' in response and response['items']
-        except Exception:
+        except PermanentServiceError:
             return False
+        except ServiceError as e:
+            print(f"Error: {e}")
+            return False
+
+    def get_uploads_playlist_id(self, channel_id):
+        """Returns the id of the playlist holding all uploads of a channel, or None if the channel doesn't exist."""
+        request = self.api.channels().list(part="contentDetails", id=channel_id)
+        response = self._execute_cached(request)
+        if not response.get('items'):
+            return None
+        return response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
 
     def check_playlist_id(self, playlist_id):
         try:
             request = self.api.playlists().list(part="snippet", id=playlist_id)
-            response = request.execute()
+            response = self._execute_cached(request)
             return 'items' in response and response['items']
-        except Exception:
+        except PermanentServiceError:
+            return False
+        except ServiceError as e:
+            print(f"Error: {e}")
             return False
 
     def get_video_details(self, video_id):
-        """Fetches details for a single video"""
-        try:
-            request = self.api.videos().list(part="snippet,contentDetails", id=video_id)
-            response = request.execute()
-            if not response.get('items'):
-                return None
-            item = response['items'][0]
-            duration_iso = item['contentDetails']['duration']
-            duration_sec = isodate.parse_duration(duration_iso).total_seconds()
-            return {
-                'id': item['id'],
-                'title': item['snippet']['title'],
-                'published_at': item['snippet']['publishedAt'],
-                'duration': duration_sec
-            }
-        except Exception as e:
-            print(f"Error fetching video details for ID {video_id}: {e}")
+        """
+        Fetches details for a single video. Returns None if the video does not exist or is private,
+        and raises a ServiceError if the API call itself fails.
+        """
+        request = self.api.videos().list(part="snippet,contentDetails", id=video_id)
+        response = self._execute_cached(request)
+        if not response.get('items'):
             return None
+        return self._parse_video_item(response['items'][0])
 
-    def fetch_channel_videos_sequentially(self, channel_id):
+    def get_videos_details(self, video_ids):
         """
-        A generator that yields basic video info (id, title, date) one by one
+        Fetches details for many videos, 50 ids per request. Returns a dict of id -> details;
+        ids that do not exist or are private are missing from it.
         """
-        page_token = None
-        while True:
-            request = self.api.search().list(
+        details = {}
+        for start in range(0, len(video_ids), MAX_IDS_PER_VIDEOS_REQUEST):
+            batch = video_ids[start:start + MAX_IDS_PER_VIDEOS_REQUEST]
+            request = self.api.videos().list(part="snippet,contentDetails", id=','.join(batch))
+            response = self._execute_cached(request)
+            for item in response.get('items', []):
+                details[item['id']] = self._parse_video_item(item)
+        return details
+
+    def _parse_video_item(self, item):
+        duration_iso = item['contentDetails']['duration']
+        duration_sec = isodate.parse_duration(duration_iso).total_seconds()
+        return {
+            'id': item['id'],
+            'title': item['snippet']['title'],
+            'published_at': item['snippet']['publishedAt'],
+            'duration': duration_sec
+        }
+
+    def fetch_channel_videos_sequentially(self, channel_id, prefetch_depth=PAGE_PREFETCH_DEPTH):
+        """
+        A generator that yields basic video info (id, title, date) one by one.
+        With prefetch_depth > 0, the next pages are fetched in the background while the current one is consumed.
+        """
+        def build_request(page_token):
+            return self.api.search().list(
                 part='snippet',
                 channelId=channel_id,
                 type='video',
@@ -66,61 +136,199 @@ class YouTubeService:
                 maxResults=50,
                 pageToken=page_token
             )
-            response = request.execute()
+
+        for response in self._iter_pages(build_request, prefetch_depth):
             for item in response.get('items', []):
                 yield {
                     'id': item['id']['videoId'],
                     'title': item['snippet']['title'],
                     'published_at': item['snippet']['publishedAt']
                 }
-            page_token = response.get('nextPageToken')
-            if not page_token:
-                break
 
-    def fetch_playlist_videos_sequentially(self, playlist_id):
+    def fetch_playlist_videos_sequentially(self, playlist_id, prefetch_depth=PAGE_PREFETCH_DEPTH, video_dates=False):
         """
         A generator that yields basic video info (id, title, date) one by one from a playlist.
+        The date is when the video was added to the playlist, or with video_dates when the video was published.
+        With prefetch_depth > 0, the next pages are fetched in the background while the current one is consumed.
         """
-        page_token = None
-        while True:
-            request = self.api.playlistItems().list(
-                part='snippet',
+        def build_request(page_token):
+            return self.api.playlistItems().list(
+                part='snippet,contentDetails' if video_dates else 'snippet',
                 playlistId=playlist_id,
                 maxResults=50,
                 pageToken=page_token
             )
-            response = request.execute()
+
+        for response in self._iter_pages(build_request, prefetch_depth):
             for item in response.get('items', []):
                 if item.get('snippet'):
+                    published_at = item['snippet'].get('publishedAt')
+                    if video_dates:
+                        # Missing for private and deleted videos.
+                        published_at = item.get('contentDetails', {}).get('videoPublishedAt', published_at)
                     yield {
                         'id': item['snippet']['resourceId']['videoId'],
                         'title': item['snippet']['title'],
-                        'published_at': item['snippet'].get('publishedAt')
+                        'published_at': published_at
                     }
+
+    def _execute_cached(self, request, http=None):
+        """
+        Executes a Data API request through the metadata cache. Fresh entries are returned without
+        a request; stale ones are revalidated with If-None-Match and reused if the server answers 304.
+        """
+        key = MetadataCache.key_for(request.uri)
+        cached_body, etag, is_fresh = self.metadata_cache.lookup(key)
+        if is_fresh:
+            self.metadata_cache.record_hit()
+            return cached_body
+        if etag:
+            request.headers['If-None-Match'] = etag
+        try:
+            response = self.api_executor.execute(request.execute, http=http)
+        except PermanentServiceError as e:
+            if e.status == 304 and cached_body is not None:
+                self.metadata_cache.revalidate(key)
+                return cached_body
+            raise
+        self.metadata_cache.record_miss()
+        self.metadata_cache.store(key, response)
+        return response
+
+    def _iter_pages(self, build_request, prefetch_depth=0):
+        """Yields the response of every page of a list call, in order."""
+        if prefetch_depth > 0:
+            yield from self._iter_pages_ahead(build_request, prefetch_depth)
+            return
+
+        page_token = None
+        while True:
+            response = self._execute_cached(build_request(page_token))
+            yield response
             page_token = response.get('nextPageToken')
             if not page_token:
                 break
 
+    def _iter_pages_ahead(self, build_request, prefetch_depth):
+        """
+        Like _iter_pages, but a background thread walks the page tokens and keeps up to
+        `prefetch_depth` pages buffered, so page fetches overlap with processing of the current page.
+        Errors are re-raised at the point in the sequence where they happened.
+        """
+        pages = queue.Queue(maxsize=prefetch_depth)
+        stop = threading.Event()
+
+        def put(item):
+            # Give up if the consumer has gone away, otherwise a full queue would block forever.
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch_pages():
+            # httplib2 connections are not thread-safe, so this thread gets its own.
+            http = httplib2.Http(timeout=REQUEST_TIMEOUT_SECONDS)
+            page_token = None
+            try:
+                while not stop.is_set():
+                    response = self._execute_cached(build_request(page_token), http=http)
+                    if not put((response, None)):
+                        return
+                    page_token = response.get('nextPageToken')
+                    if not page_token:
+                        return
+            except Exception as e:
+                put((None, e))
 
-    def get_transcript(self, video_id):
+        worker = threading.Thread(target=fetch_pages, name='youtube-page-prefetch', daemon=True)
+        worker.start()
+        try:
+            while True:
+                response, error = pages.get()
+                if error:
+                    raise error
+                yield response
+                if not response.get('nextPageToken'):
+                    break
+        finally:
+            stop.set()
+
+    def get_transcript(self, video_id, languages=None):
+        """
+        Returns the joined transcript text, or None if the video has no captions in any language.
+        Raises a ServiceError if the transcript could not be fetched.
+        """
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['en', 'vi'])
-            return ' '.join([part['text'] for part in transcript_list])
-        except (TranscriptsDisabled, CouldNotRetrieveTranscript):
+            transcript = self.find_transcript(video_id, languages)
+            if not transcript:
+                return None
+            fetched = self.transcript_executor.execute(transcript.fetch)
+            snippets = fetched.to_raw_data()
+            if transcript.is_generated:
+                # Rolling auto-captions repeat the end of each line at the start of the next.
+                return merge_caption_snippets(snippets)
+            return ' '.join(snippet['text'] for snippet in snippets)
+        except NO_CAPTIONS_ERRORS:
             return None
-        except Exception as e:
-            # Catch any other unexpected errors.
-            print(f"An unexpected error occurred while fetching transcript for video ID {video_id}: {e}")
-            return "Error retrieving transcript."
+
+    def find_transcript(self, video_id, languages=None):
+        """
+        Picks the best caption track for a video without fetching it, or returns None if there is none.
+
+        Tracks in the preferred languages come first, manual before auto-generated. Failing that,
+        YouTube's translation of an existing track into a preferred language is used, and as a last
+        resort any track in its original language, since any captions are cheaper than ASR.
+        """
+        languages = languages or TRANSCRIPT_LANGUAGES
+        transcript_list = self.list_transcripts(video_id)
+        if transcript_list is None:
+            return None
+
+        for find in (transcript_list.find_manually_created_transcript, transcript_list.find_generated_transcript):
+            try:
+                return find(languages)
+            except NoTranscriptFound:
+                continue
+
+        # Iterating a TranscriptList yields the manual tracks before the generated ones.
+        tracks = list(transcript_list)
+        for language in languages:
+            for track in tracks:
+                try:
+                    return track.translate(language)
+                except NO_CAPTIONS_ERRORS:  # NotTranslatable, TranslationLanguageNotAvailable
+                    continue
+
+        return tracks[0] if tracks else None
+
+    def list_transcripts(self, video_id):
+        """
+        Lists the caption tracks of a video, or returns None if it definitively has none (captions
+        disabled, video unavailable). Cached per video. Raises a ServiceError if the lookup failed,
+        e.g. because requests are being throttled or blocked; those outcomes are not cached.
+        """
+        if video_id in self._transcript_lists:
+            self._transcript_lists.move_to_end(video_id)
+            return self._transcript_lists[video_id]
+        try:
+            transcript_list = self.transcript_executor.execute(self.transcript_api.list, video_id)
+        except NO_CAPTIONS_ERRORS:
+            transcript_list = None
+        self._transcript_lists[video_id] = transcript_list
+        if len(self._transcript_lists) > TRANSCRIPT_LIST_CACHE_SIZE:
+            self._transcript_lists.popitem(last=False)
+        return transcript_list
 
     def get_playlist_id_from_url(self, url):
-        match = re.search(r'list=([^&]*)', url)
+        match = PLAYLIST_ID_PATTERN.search(url)
         return match.group(1) if match else None
 
     def get_video_id_from_url(self, url):
-        patterns = [r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', r'(?:youtu\.be\/|shorts\/)([0-9A-Za-z_-]{11})']
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in VIDEO_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         return None